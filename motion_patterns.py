@@ -8,9 +8,54 @@ Supports various flight behaviors including normal circular flight and anomalous
 
 import math
 import time
+from bisect import bisect_right
 from abc import ABC, abstractmethod
 
 
+def _circular_state(current_time, center_lat, center_lon, radius_deg, angular_speed, rate_m):
+    """
+    Evaluate a circular track at a given time.
+
+    rate_m is the tangential speed scale radius_deg * angular_speed * 111320.
+
+    Returns:
+        tuple: (lat, lon, gs_knots, track_deg)
+    """
+    # Same reduction clients use to reconstruct the phase from the payload's "now"
+    theta = (current_time * angular_speed) % math.tau
+    sin_t = math.sin(theta)
+    cos_t = math.cos(theta)
+
+    lat = center_lat + radius_deg * cos_t
+    lon = center_lon + radius_deg * sin_t
+
+    dlat_dt_m = -rate_m * sin_t
+    dlon_dt_m = rate_m * cos_t * math.cos(math.radians(lat))
+
+    gs_knots = math.sqrt(dlat_dt_m**2 + dlon_dt_m**2) * 1.94384
+    track_deg = math.degrees(math.atan2(dlon_dt_m, dlat_dt_m)) % 360
+    return lat, lon, gs_knots, track_deg
+
+
+def _advance(lat, lon, distance_deg, cos_dir, sin_dir, cos_lat):
+    """
+    Move a point along a direction on a flat-earth grid.
+
+    distance_deg is the distance travelled in degrees of latitude
+    (metres / 111320); cos_dir and sin_dir describe the direction of travel.
+    cos_lat scales longitude and is taken at the start of the leg, which
+    holds while the leg's change in latitude stays small. Open-ended legs pass
+    None to scale longitude at the new latitude instead.
+
+    Returns:
+        tuple: (lat, lon) in degrees
+    """
+    new_lat = lat + distance_deg * cos_dir
+    if cos_lat is None:
+        cos_lat = math.cos(math.radians(new_lat))
+    return new_lat, lon + distance_deg * sin_dir / cos_lat
+
+
 class MotionPattern(ABC):
     """Abstract base class for aircraft motion patterns."""
 
@@ -44,6 +89,19 @@ class MotionPattern(ABC):
         """
         pass
 
+    def get_state(self, current_time):
+        """
+        Calculate position, velocity and heading at given time in one call.
+
+        Subclasses override this to share the work the three getters would
+        otherwise repeat.
+
+        Returns:
+            tuple: (lat, lon, gs_knots, track_deg)
+        """
+        lat, lon = self.get_position(current_time)
+        return lat, lon, self.get_velocity(current_time), self.get_heading(current_time)
+
 
 class CircularMotion(MotionPattern):
     """Circular flight pattern around a center point."""
@@ -63,37 +121,31 @@ class CircularMotion(MotionPattern):
         self.radius_deg = radius_deg
         self.angular_speed = angular_speed
 
-    def get_position(self, current_time):
-        theta = (current_time * self.angular_speed) % (2 * math.pi)
-        lat = self.center_lat + self.radius_deg * math.cos(theta)
-        lon = self.center_lon + self.radius_deg * math.sin(theta)
-        return lat, lon
+        self._rate_m = radius_deg * angular_speed * 111320
+        self._last_state = None
 
-    def get_velocity(self, current_time):
-        theta = (current_time * self.angular_speed) % (2 * math.pi)
-        lat, _ = self.get_position(current_time)
+    def get_state(self, current_time):
+        # Aircraft sharing this pattern are all queried for the same instant,
+        # so the most recent evaluation is kept as (time, state).
+        last_state = self._last_state
+        if last_state is not None and last_state[0] == current_time:
+            return last_state[1]
 
-        dlat_dt = -self.radius_deg * self.angular_speed * math.sin(theta)
-        dlon_dt = self.radius_deg * self.angular_speed * math.cos(theta)
+        state = _circular_state(
+            current_time, self.center_lat, self.center_lon, self.radius_deg, self.angular_speed, self._rate_m
+        )
+        self._last_state = (current_time, state)
+        return state
 
-        dlat_dt_m = dlat_dt * 111320
-        dlon_dt_m = dlon_dt * 111320 * math.cos(math.radians(lat))
+    def get_position(self, current_time):
+        lat, lon, _, _ = self.get_state(current_time)
+        return lat, lon
 
-        speed_ms = math.sqrt(dlat_dt_m**2 + dlon_dt_m**2)
-        return speed_ms * 1.94384
+    def get_velocity(self, current_time):
+        return self.get_state(current_time)[2]
 
     def get_heading(self, current_time):
-        theta = (current_time * self.angular_speed) % (2 * math.pi)
-        lat, _ = self.get_position(current_time)
-
-        dlat_dt = -self.radius_deg * self.angular_speed * math.sin(theta)
-        dlon_dt = self.radius_deg * self.angular_speed * math.cos(theta)
-
-        dlat_dt_m = dlat_dt * 111320
-        dlon_dt_m = dlon_dt * 111320 * math.cos(math.radians(lat))
-
-        track_rad = math.atan2(dlon_dt_m, dlat_dt_m)
-        return math.degrees(track_rad) % 360
+        return self.get_state(current_time)[3]
 
 
 class SupersonicLinearMotion(MotionPattern):
@@ -118,22 +170,28 @@ class SupersonicLinearMotion(MotionPattern):
 
         self.velocity_ms = mach_number * 343.0
 
-    def get_position(self, current_time):
-        dt = current_time - self.start_time
-
-        dlat = (self.velocity_ms * dt / 111320) * math.cos(self.direction_rad)
-        dlon = (self.velocity_ms * dt / 111320) * math.sin(self.direction_rad)
-
-        lat = self.start_lat + dlat
-        lon = self.start_lon + (dlon / math.cos(math.radians(lat)))
+        self._cos_dir = math.cos(self.direction_rad)
+        self._sin_dir = math.sin(self.direction_rad)
+        self._deg_per_sec = self.velocity_ms / 111320
+        self._gs_knots = self.velocity_ms * 1.94384
+        self._heading_deg = math.degrees(self.direction_rad) % 360
 
-        return lat, lon
+    def get_position(self, current_time):
+        distance_deg = self._deg_per_sec * (current_time - self.start_time)
+        lat = self.start_lat + distance_deg * self._cos_dir
+        # The leg never ends, so a cached leg-start cos(lat) would drift without
+        # bound; longitude is scaled at the current latitude instead.
+        return lat, self.start_lon + distance_deg * self._sin_dir / math.cos(math.radians(lat))
 
     def get_velocity(self, current_time):
-        return self.velocity_ms * 1.94384
+        return self._gs_knots
 
     def get_heading(self, current_time):
-        return math.degrees(self.direction_rad) % 360
+        return self._heading_deg
+
+    def get_state(self, current_time):
+        lat, lon = self.get_position(current_time)
+        return lat, lon, self._gs_knots, self._heading_deg
 
 
 class InstantDirectionChangeMotion(MotionPattern):
@@ -159,87 +217,89 @@ class InstantDirectionChangeMotion(MotionPattern):
         self.change_interval = change_interval_sec
         self.start_time = start_time if start_time is not None else time.time()
 
-        self.segment_positions = []
+        self._deg_per_sec = self.velocity_ms / 111320
+
+        # Segment state is stored as parallel lists indexed by segment number.
+        self._seg_time = []
+        self._seg_lat = []
+        self._seg_lon = []
+        self._seg_cos_dir = []
+        self._seg_sin_dir = []
+        self._seg_heading = []
+        self._seg_cos_lat = []
         self._compute_segments()
 
+    def _add_segment(self, seg_time, lat, lon, cos_dir, sin_dir, heading_deg):
+        self._seg_time.append(seg_time)
+        self._seg_lat.append(lat)
+        self._seg_lon.append(lon)
+        self._seg_cos_lat.append(math.cos(math.radians(lat)))
+        self._seg_cos_dir.append(cos_dir)
+        self._seg_sin_dir.append(sin_dir)
+        self._seg_heading.append(heading_deg)
+
     def _compute_segments(self):
-        """Pre-compute position at each direction change."""
+        """
+        Pre-compute position at each direction change.
+
+        Every change is a 90 degree right turn, so the next segment's direction
+        cosines are a rotation of the current ones: (cos, sin) -> (-sin, cos).
+        Only the initial direction needs trig.
+        """
         current_lat = self.start_lat
         current_lon = self.start_lon
-        current_dir = self.initial_direction_rad
+        cos_dir = math.cos(self.initial_direction_rad)
+        sin_dir = math.sin(self.initial_direction_rad)
+        heading_deg = math.degrees(self.initial_direction_rad) % 360
         current_time = 0
+        step_deg = self._deg_per_sec * self.change_interval
 
-        self.segment_positions.append({
-            'time': current_time,
-            'lat': current_lat,
-            'lon': current_lon,
-            'direction': current_dir
-        })
+        self._add_segment(current_time, current_lat, current_lon, cos_dir, sin_dir, heading_deg)
 
         for i in range(10):
             current_time += self.change_interval
-            dt = self.change_interval
-
-            dlat = (self.velocity_ms * dt / 111320) * math.cos(current_dir)
-            dlon = (self.velocity_ms * dt / 111320) * math.sin(current_dir)
-
-            current_lat += dlat
-            current_lon += dlon / math.cos(math.radians(current_lat))
-
-            current_dir = math.radians((math.degrees(current_dir) + 90) % 360)
-
-            self.segment_positions.append({
-                'time': current_time,
-                'lat': current_lat,
-                'lon': current_lon,
-                'direction': current_dir
-            })
+            current_lat, current_lon = _advance(
+                current_lat, current_lon, step_deg, cos_dir, sin_dir, self._seg_cos_lat[-1]
+            )
+
+            cos_dir, sin_dir = -sin_dir, cos_dir
+            heading_deg = (heading_deg + 90) % 360
+
+            self._add_segment(current_time, current_lat, current_lon, cos_dir, sin_dir, heading_deg)
+
+    def _segment_index(self, dt):
+        """Index of the segment active at dt seconds after start_time."""
+        # A dt before start_time yields -1, which selects the last segment.
+        return bisect_right(self._seg_time, dt) - 1
+
+    def _position(self, dt, i):
+        # The last segment never ends, so its leg-start cos(lat) would drift
+        # without bound.
+        open_ended = i == -1 or i == len(self._seg_time) - 1
+        return _advance(
+            self._seg_lat[i],
+            self._seg_lon[i],
+            self._deg_per_sec * (dt - self._seg_time[i]),
+            self._seg_cos_dir[i],
+            self._seg_sin_dir[i],
+            None if open_ended else self._seg_cos_lat[i],
+        )
 
     def get_position(self, current_time):
         dt = current_time - self.start_time
-
-        for i in range(len(self.segment_positions) - 1):
-            seg = self.segment_positions[i]
-            next_seg = self.segment_positions[i + 1]
-
-            if seg['time'] <= dt < next_seg['time']:
-                time_in_segment = dt - seg['time']
-                direction = seg['direction']
-
-                dlat = (self.velocity_ms * time_in_segment / 111320) * math.cos(direction)
-                dlon = (self.velocity_ms * time_in_segment / 111320) * math.sin(direction)
-
-                lat = seg['lat'] + dlat
-                lon = seg['lon'] + dlon / math.cos(math.radians(lat))
-
-                return lat, lon
-
-        last_seg = self.segment_positions[-1]
-        time_since_last = dt - last_seg['time']
-        direction = last_seg['direction']
-
-        dlat = (self.velocity_ms * time_since_last / 111320) * math.cos(direction)
-        dlon = (self.velocity_ms * time_since_last / 111320) * math.sin(direction)
-
-        lat = last_seg['lat'] + dlat
-        lon = last_seg['lon'] + dlon / math.cos(math.radians(lat))
-
-        return lat, lon
+        return self._position(dt, self._segment_index(dt))
 
     def get_velocity(self, current_time):
         return self.velocity_knots
 
     def get_heading(self, current_time):
-        dt = current_time - self.start_time
-
-        for i in range(len(self.segment_positions) - 1):
-            seg = self.segment_positions[i]
-            next_seg = self.segment_positions[i + 1]
+        return self._seg_heading[self._segment_index(current_time - self.start_time)]
 
-            if seg['time'] <= dt < next_seg['time']:
-                return math.degrees(seg['direction']) % 360
-
-        return math.degrees(self.segment_positions[-1]['direction']) % 360
+    def get_state(self, current_time):
+        dt = current_time - self.start_time
+        i = self._segment_index(dt)
+        lat, lon = self._position(dt, i)
+        return lat, lon, self.velocity_knots, self._seg_heading[i]
 
 
 class InstantAccelerationMotion(MotionPattern):
@@ -262,7 +322,18 @@ class InstantAccelerationMotion(MotionPattern):
         self.speed_profile = speed_profile
         self.start_time = start_time if start_time is not None else time.time()
 
-        self.segments = []
+        self._cos_dir = math.cos(self.direction_rad)
+        self._sin_dir = math.sin(self.direction_rad)
+        self._heading_deg = math.degrees(self.direction_rad) % 360
+
+        # Segment state is stored as parallel lists indexed by segment number.
+        self._seg_start_time = []
+        self._seg_end_time = []
+        self._seg_lat = []
+        self._seg_lon = []
+        self._seg_speed_knots = []
+        self._seg_speed_deg = []
+        self._seg_cos_lat = []
         self._compute_segments()
 
     def _compute_segments(self):
@@ -272,58 +343,61 @@ class InstantAccelerationMotion(MotionPattern):
         current_time = 0
 
         for duration_sec, speed_knots in self.speed_profile:
-            speed_ms = speed_knots * 0.514444
-
-            self.segments.append({
-                'start_time': current_time,
-                'end_time': current_time + duration_sec,
-                'start_lat': current_lat,
-                'start_lon': current_lon,
-                'speed_knots': speed_knots,
-                'speed_ms': speed_ms
-            })
-
-            dlat = (speed_ms * duration_sec / 111320) * math.cos(self.direction_rad)
-            dlon = (speed_ms * duration_sec / 111320) * math.sin(self.direction_rad)
-
-            current_lat += dlat
-            current_lon += dlon / math.cos(math.radians(current_lat))
+            speed_deg = speed_knots * 0.514444 / 111320
+
+            self._seg_start_time.append(current_time)
+            self._seg_end_time.append(current_time + duration_sec)
+            self._seg_lat.append(current_lat)
+            self._seg_lon.append(current_lon)
+            self._seg_speed_knots.append(speed_knots)
+            self._seg_speed_deg.append(speed_deg)
+            self._seg_cos_lat.append(math.cos(math.radians(current_lat)))
+
+            current_lat, current_lon = _advance(
+                current_lat, current_lon, speed_deg * duration_sec, self._cos_dir, self._sin_dir, self._seg_cos_lat[-1]
+            )
             current_time += duration_sec
 
+    def _segment_index(self, dt):
+        """Index of the segment active at dt seconds after start_time, or None past the profile."""
+        i = bisect_right(self._seg_start_time, dt) - 1
+        if i < 0 or dt >= self._seg_end_time[i]:
+            return None
+        return i
+
+    def _position(self, dt, i):
+        if i is None:
+            # Outside the profile the last segment is extrapolated without end,
+            # so its leg-start cos(lat) would drift without bound.
+            i = -1
+            elapsed = dt - self._seg_end_time[i]
+            cos_lat = None
+        else:
+            elapsed = dt - self._seg_start_time[i]
+            cos_lat = self._seg_cos_lat[i]
+
+        return _advance(
+            self._seg_lat[i],
+            self._seg_lon[i],
+            self._seg_speed_deg[i] * elapsed,
+            self._cos_dir,
+            self._sin_dir,
+            cos_lat,
+        )
+
     def get_position(self, current_time):
         dt = current_time - self.start_time
-
-        for seg in self.segments:
-            if seg['start_time'] <= dt < seg['end_time']:
-                time_in_segment = dt - seg['start_time']
-
-                dlat = (seg['speed_ms'] * time_in_segment / 111320) * math.cos(self.direction_rad)
-                dlon = (seg['speed_ms'] * time_in_segment / 111320) * math.sin(self.direction_rad)
-
-                lat = seg['start_lat'] + dlat
-                lon = seg['start_lon'] + dlon / math.cos(math.radians(lat))
-
-                return lat, lon
-
-        last_seg = self.segments[-1]
-        time_since_last = dt - last_seg['end_time']
-
-        dlat = (last_seg['speed_ms'] * time_since_last / 111320) * math.cos(self.direction_rad)
-        dlon = (last_seg['speed_ms'] * time_since_last / 111320) * math.sin(self.direction_rad)
-
-        lat = last_seg['start_lat'] + dlat
-        lon = last_seg['start_lon'] + dlon / math.cos(math.radians(lat))
-
-        return lat, lon
+        return self._position(dt, self._segment_index(dt))
 
     def get_velocity(self, current_time):
-        dt = current_time - self.start_time
-
-        for seg in self.segments:
-            if seg['start_time'] <= dt < seg['end_time']:
-                return seg['speed_knots']
-
-        return self.segments[-1]['speed_knots']
+        i = self._segment_index(current_time - self.start_time)
+        return self._seg_speed_knots[-1 if i is None else i]
 
     def get_heading(self, current_time):
-        return math.degrees(self.direction_rad) % 360
+        return self._heading_deg
+
+    def get_state(self, current_time):
+        dt = current_time - self.start_time
+        i = self._segment_index(dt)
+        lat, lon = self._position(dt, i)
+        return lat, lon, self._seg_speed_knots[-1 if i is None else i], self._heading_deg
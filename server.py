@@ -33,10 +33,13 @@ import threading
 import os
 import json
 import random
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+import traceback
+import numpy as np
+import orjson
+from flask import Flask, Response, abort, request
+from waitress import serve
 from dotenv import load_dotenv
-import uuid
+from dataclasses import dataclass
 from motion_patterns import (
     MotionPattern,
     CircularMotion,
@@ -57,70 +60,166 @@ def require_env_var(var_name):
     return value
 
 
-REQUIRED_ENV_VARS = [
-    "TX_LAT",
-    "TX_LON",
-    "TX_ALT",
-    "FC_MHZ",
-    "RADIUS_DEG",
-    "ANGULAR_SPEED",
-    "ALT_BARO_FT",
-    "ICAO_HEX",
-    "HOST",
-    "PORT",
-    "RADARS",
-]
-for var in REQUIRED_ENV_VARS:
-    require_env_var(var)
-
-TX_LAT = float(os.environ.get("TX_LAT"))
-TX_LON = float(os.environ.get("TX_LON"))
-TX_ALT = int(os.environ.get("TX_ALT"))
-FC_MHZ = float(os.environ.get("FC_MHZ"))
-
-# FREEZE_TIMESTAMP: if set to "true", json.now will stay constant
-FREEZE_TIMESTAMP = os.environ.get("FREEZE_TIMESTAMP", "false").lower() == "true"
-FROZEN_TIMESTAMP = time.time() if FREEZE_TIMESTAMP else None
-if FREEZE_TIMESTAMP:
-    print(f"[synthetic_adsb_server] FREEZE_TIMESTAMP enabled - json.now frozen at {FROZEN_TIMESTAMP}")
-
-RADIUS_DEG = float(os.environ.get("RADIUS_DEG"))
-ANGULAR_SPEED = float(os.environ.get("ANGULAR_SPEED"))
-ALT_BARO_FT = int(os.environ.get("ALT_BARO_FT"))
-ICAO_HEX = os.environ.get("ICAO_HEX")
-
-HOST = os.environ.get("HOST")
-PORT = int(os.environ.get("PORT"))
-
-try:
-    RADARS = json.loads(os.environ.get("RADARS"))
-except json.JSONDecodeError:
-    raise EnvironmentError("Failed to parse RADARS from environment variable.")
-
-ENABLE_ANOMALIES = os.environ.get("ENABLE_ANOMALIES", "false").lower() == "true"
-NORMAL_AIRCRAFT_COUNT = int(os.environ.get("NORMAL_AIRCRAFT_COUNT", "1"))
-ANOMALOUS_AIRCRAFT_COUNT = int(os.environ.get("ANOMALOUS_AIRCRAFT_COUNT", "0")) if ENABLE_ANOMALIES else 0
-ANOMALY_ADSB_PROBABILITY = float(os.environ.get("ANOMALY_ADSB_PROBABILITY", "0.1"))
-
-SUPERSONIC_MACH_MIN = float(os.environ.get("SUPERSONIC_MACH_MIN", "2.0"))
-SUPERSONIC_MACH_MAX = float(os.environ.get("SUPERSONIC_MACH_MAX", "5.0"))
-SUPERSONIC_ALTITUDE_FT = int(os.environ.get("SUPERSONIC_ALTITUDE_FT", "50000"))
+@dataclass(frozen=True, slots=True)
+class RadarConfig:
+    """A synthetic radar receiver and its precomputed detection constants."""
+
+    id: str
+    lat: float
+    lon: float
+    alt: float
+    port: int
+    frequency: float
+    # Receiver position in radians and the cosine of its latitude, for the
+    # haversine in the detection kernel
+    lat_rad: float
+    lon_rad: float
+    cos_lat: float
+    # Hz of doppler shift per m/s of aircraft speed
+    doppler_scale: float
+    # Position in the parallel receiver arrays used for vectorized detection
+    index: int
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Server configuration, parsed once from the environment at startup."""
+
+    tx_lat: float
+    tx_lon: float
+    tx_alt: int
+    fc_mhz: float
+    radius_deg: float
+    angular_speed: float
+    alt_baro_ft: int
+    icao_hex: str
+    host: str
+    port: int
+    server_threads: int
+    radars: dict[int, RadarConfig]
+    freeze_timestamp: bool
+    frozen_timestamp: float | None
+    freeze_aircraft: bool
+    normal_aircraft_count: int
+    anomalous_aircraft_count: int
+    anomaly_adsb_probability: float
+    supersonic_mach_min: float
+    supersonic_mach_max: float
+    supersonic_altitude_ft: int
+
+    @classmethod
+    def from_env(cls):
+        """Read, validate and convert every setting from os.environ."""
+        settings = {field: convert(require_env_var(name)) for name, (field, convert) in _REQUIRED_SETTINGS.items()}
+        for name, (field, convert, default) in _OPTIONAL_SETTINGS.items():
+            settings[field] = convert(os.environ.get(name, default))
+
+        try:
+            radars = json.loads(require_env_var("RADARS"))
+        except json.JSONDecodeError:
+            raise EnvironmentError("Failed to parse RADARS from environment variable.")
+
+        fc_mhz = settings["fc_mhz"]
+        radar_configs = {}
+        for radar in radars:
+            if "port" not in radar:
+                raise EnvironmentError(f"Radar {radar.get('id', 'unknown')} missing 'port' field in RADARS config")
+            radar_configs[radar["port"]] = RadarConfig(
+                id=radar["id"],
+                lat=radar["lat"],
+                lon=radar["lon"],
+                alt=radar["alt"],
+                port=radar["port"],
+                frequency=fc_mhz * 1e6,
+                lat_rad=math.radians(radar["lat"]),
+                lon_rad=math.radians(radar["lon"]),
+                cos_lat=math.cos(math.radians(radar["lat"])),
+                doppler_scale=2 * fc_mhz * 1e6 / 299792458,
+                index=len(radar_configs),
+            )
+
+        if not radar_configs:
+            raise EnvironmentError("RADARS must list at least one radar.")
+        settings["radars"] = radar_configs
+
+        # FREEZE_TIMESTAMP: if set to "true", json.now will stay constant.
+        # FREEZE_AIRCRAFT: with FREEZE_TIMESTAMP, every aircraft also stays at
+        # its state at the frozen timestamp.
+        settings["frozen_timestamp"] = time.time() if settings["freeze_timestamp"] else None
+        settings["freeze_aircraft"] = settings["freeze_timestamp"] and settings["freeze_aircraft"]
+        if not settings.pop("enable_anomalies"):
+            settings["anomalous_aircraft_count"] = 0
+
+        return cls(**settings)
+
+
+def _env_flag(value):
+    return value.lower() == "true"
+
+
+# Environment variable -> (Config field, converter) for settings that must be set.
+_REQUIRED_SETTINGS = {
+    "TX_LAT": ("tx_lat", float),
+    "TX_LON": ("tx_lon", float),
+    "TX_ALT": ("tx_alt", int),
+    "FC_MHZ": ("fc_mhz", float),
+    "RADIUS_DEG": ("radius_deg", float),
+    "ANGULAR_SPEED": ("angular_speed", float),
+    "ALT_BARO_FT": ("alt_baro_ft", int),
+    "ICAO_HEX": ("icao_hex", str),
+    "HOST": ("host", str),
+    "PORT": ("port", int),
+}
+
+# Environment variable -> (Config field, converter, default) for optional settings.
+# enable_anomalies is consumed by Config.from_env rather than stored.
+_OPTIONAL_SETTINGS = {
+    "SERVER_THREADS": ("server_threads", int, "8"),
+    "FREEZE_TIMESTAMP": ("freeze_timestamp", _env_flag, "false"),
+    "FREEZE_AIRCRAFT": ("freeze_aircraft", _env_flag, "false"),
+    "ENABLE_ANOMALIES": ("enable_anomalies", _env_flag, "false"),
+    "NORMAL_AIRCRAFT_COUNT": ("normal_aircraft_count", int, "1"),
+    "ANOMALOUS_AIRCRAFT_COUNT": ("anomalous_aircraft_count", int, "0"),
+    "ANOMALY_ADSB_PROBABILITY": ("anomaly_adsb_probability", float, "0.1"),
+    "SUPERSONIC_MACH_MIN": ("supersonic_mach_min", float, "2.0"),
+    "SUPERSONIC_MACH_MAX": ("supersonic_mach_max", float, "5.0"),
+    "SUPERSONIC_ALTITUDE_FT": ("supersonic_altitude_ft", int, "50000"),
+}
+
+CONFIG = Config.from_env()
+if CONFIG.freeze_timestamp:
+    print(f"[synthetic_adsb_server] FREEZE_TIMESTAMP enabled - json.now frozen at {CONFIG.frozen_timestamp}")
+if CONFIG.freeze_aircraft:
+    print("[synthetic_adsb_server] FREEZE_AIRCRAFT enabled - aircraft held at the frozen timestamp")
+
+TX_LAT_RAD = math.radians(CONFIG.tx_lat)
+TX_LON_RAD = math.radians(CONFIG.tx_lon)
+TX_COS_LAT = math.cos(TX_LAT_RAD)
 
 app = Flask(__name__)
-CORS(app)
-
-radar_configs = {}
-for radar in RADARS:
-    if "port" not in radar:
-        raise EnvironmentError(f"Radar {radar.get('id', 'unknown')} missing 'port' field in RADARS config")
-    port = radar["port"]
-    radar_configs[port] = {
-        "id": radar["id"],
-        "lat": radar["lat"],
-        "lon": radar["lon"],
-        "alt": radar["alt"],
-        "frequency": FC_MHZ * 1e6
-    }
+
+# Every endpoint is public and read-only, so responses carry a fixed CORS
+# header instead of going through flask-cors on each request.
+_CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+
+
+def _json_response(body):
+    """Wrap an already serialized JSON body in a response."""
+    return Response(body, mimetype="application/json", headers=_CORS_HEADERS)
+
+
+def _json(payload):
+    """Serialize payload with orjson into an application/json response."""
+    return _json_response(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
+# Receiver geometry as parallel arrays, indexed by RadarConfig.index, so
+# detections for every radar are computed in a single vectorized pass.
+_rx_lat_rad = np.array([config.lat_rad for config in CONFIG.radars.values()], dtype=np.float64)
+_rx_lon_rad = np.array([config.lon_rad for config in CONFIG.radars.values()], dtype=np.float64)
+_rx_cos_lat = np.array([config.cos_lat for config in CONFIG.radars.values()], dtype=np.float64)
+_rx_alt = np.array([config.alt for config in CONFIG.radars.values()], dtype=np.float64)
+_doppler_scale = np.array([config.doppler_scale for config in CONFIG.radars.values()], dtype=np.float64)
 
 
 class Aircraft:
@@ -148,14 +247,18 @@ class Aircraft:
         self.adsb_gs_override = adsb_gs_override
         self.adsb_track_override = adsb_track_override
 
-    def get_data(self, current_time, timestamp_for_json):
-        lat, lon = self.motion_pattern.get_position(current_time)
-        actual_gs_knots = self.motion_pattern.get_velocity(current_time)
-        actual_track_deg = self.motion_pattern.get_heading(current_time)
+        # Synthetic detection SNR; derived from the ICAO address so it is
+        # stable across restarts, unlike the randomized str hash.
+        self.snr_db = 15.0 + int(icao_hex, 16) % 10
 
-        if not self.has_adsb:
-            return None
+    def adsb_data(self, lat, lon, actual_gs_knots, actual_track_deg):
+        """
+        Build the tar1090 entry from a motion state.
 
+        Only meaningful for aircraft with has_adsb; AircraftManager never asks
+        the others. Values are passed through unrounded; orjson already writes
+        the shortest representation that round-trips.
+        """
         if self.adsb_accurate:
             gs_knots = actual_gs_knots
             track_deg = actual_track_deg
@@ -165,18 +268,46 @@ class Aircraft:
 
         return {
             "hex": self.icao_hex,
-            "lat": round(lat, 6),
-            "lon": round(lon, 6),
+            "lat": lat,
+            "lon": lon,
             "alt_baro": self.altitude_ft,
             "alt_geom": self.altitude_ft + 100,
-            "gs": round(gs_knots, 1),
-            "track": round(track_deg, 2),
-            "true_heading": round(track_deg, 2),
+            "gs": gs_knots,
+            "track": track_deg,
+            "true_heading": track_deg,
             "flight": self.flight_number,
             "seen_pos": 0,
         }
 
 
+@dataclass(frozen=True, slots=True)
+class RadarAircraftData:
+    """True state of every aircraft as parallel arrays, for synthetic radar detections."""
+
+    # Time the motion patterns were evaluated at
+    time: float
+    hex: list[str]
+    lat: np.ndarray
+    lon: np.ndarray
+    alt_m: np.ndarray
+    gs_knots: np.ndarray
+    snr_db: np.ndarray
+    # Detections against every radar, computed once per snapshot and rounded to
+    # 2 decimals; shape (n_radars, n_aircraft), row RadarConfig.index per radar
+    bistatic_range_m: np.ndarray
+    doppler_hz: np.ndarray
+
+    def __len__(self):
+        return len(self.hex)
+
+
+# Aircraft move slowly relative to the polling rate, so requests falling in the
+# same SNAPSHOT_INTERVAL-second time bucket share one evaluation of every motion
+# pattern. When the server runs, a ticker thread refreshes the snapshot at this
+# interval instead.
+SNAPSHOT_INTERVAL = 0.05
+
+
 class AircraftManager:
     """Manages multiple aircraft with different motion patterns."""
 
@@ -184,45 +315,78 @@ class AircraftManager:
         self.aircraft_list = []
         self._initialize_aircraft()
 
+        # (time bucket, adsb payload, radar data) of the latest snapshot
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
+        self._ticker = None
+
+        # Per-aircraft values that never change, laid out for RadarAircraftData.
+        self._hex = [aircraft.icao_hex for aircraft in self.aircraft_list]
+        self._alt_m = np.array(
+            [(aircraft.altitude_ft + 100) * 0.3048 for aircraft in self.aircraft_list], dtype=np.float64
+        )
+        self._snr_db = np.array([aircraft.snr_db for aircraft in self.aircraft_list], dtype=np.float64)
+
+        # Aircraft grouped by motion pattern as (pattern, row indices), so a
+        # pattern shared by many aircraft is evaluated once and broadcast to
+        # all of its rows.
+        groups = {}
+        for index, aircraft in enumerate(self.aircraft_list):
+            groups.setdefault(id(aircraft.motion_pattern), (aircraft.motion_pattern, []))[1].append(index)
+        self._motion_groups = [(motion, np.array(indices)) for motion, indices in groups.values()]
+
+        # Only aircraft with ADS-B appear in aircraft.json; their rows in the state array.
+        self._adsb_aircraft = [aircraft for aircraft in self.aircraft_list if aircraft.has_adsb]
+        self._adsb_indices = np.array(
+            [index for index, aircraft in enumerate(self.aircraft_list) if aircraft.has_adsb], dtype=np.intp
+        )
+
     def _generate_icao_hex(self, index):
-        base_hex = int(ICAO_HEX, 16) if ICAO_HEX else 0xAEF123
+        base_hex = int(CONFIG.icao_hex, 16) if CONFIG.icao_hex else 0xAEF123
         return f"{(base_hex + index):06X}"
 
     def _initialize_aircraft(self):
         aircraft_index = 0
 
-        for i in range(NORMAL_AIRCRAFT_COUNT):
+        # Normal aircraft fly the same circle, so they share one motion pattern
+        # and its per-instant evaluation.
+        motion = CircularMotion(CONFIG.tx_lat, CONFIG.tx_lon, CONFIG.radius_deg, CONFIG.angular_speed)
+        for i in range(CONFIG.normal_aircraft_count):
             icao_hex = self._generate_icao_hex(aircraft_index)
-            motion = CircularMotion(TX_LAT, TX_LON, RADIUS_DEG, ANGULAR_SPEED)
             flight_number = f"SYN{aircraft_index + 1:03d}  "
 
             aircraft = Aircraft(
                 icao_hex=icao_hex,
                 motion_pattern=motion,
-                altitude_ft=ALT_BARO_FT,
+                altitude_ft=CONFIG.alt_baro_ft,
                 flight_number=flight_number,
                 is_anomalous=False,
             )
             self.aircraft_list.append(aircraft)
             aircraft_index += 1
 
-        for i in range(ANOMALOUS_AIRCRAFT_COUNT):
+        # Frozen aircraft are evaluated at frozen_timestamp, so their patterns
+        # must start there rather than at construction time, which is later.
+        start_time = CONFIG.frozen_timestamp if CONFIG.freeze_aircraft else None
+
+        for i in range(CONFIG.anomalous_aircraft_count):
             icao_hex = self._generate_icao_hex(aircraft_index)
             direction = random.uniform(0, 360)
-            start_lat = TX_LAT + random.uniform(-0.1, 0.1)
-            start_lon = TX_LON + random.uniform(-0.1, 0.1)
+            start_lat = CONFIG.tx_lat + random.uniform(-0.1, 0.1)
+            start_lon = CONFIG.tx_lon + random.uniform(-0.1, 0.1)
 
             anomaly_type = random.choice(["supersonic", "direction_change", "acceleration"])
 
             if anomaly_type == "supersonic":
-                mach = random.uniform(SUPERSONIC_MACH_MIN, SUPERSONIC_MACH_MAX)
+                mach = random.uniform(CONFIG.supersonic_mach_min, CONFIG.supersonic_mach_max)
                 motion = SupersonicLinearMotion(
                     start_lat=start_lat,
                     start_lon=start_lon,
                     mach_number=mach,
                     direction_deg=direction,
+                    start_time=start_time,
                 )
-                altitude_ft = SUPERSONIC_ALTITUDE_FT
+                altitude_ft = CONFIG.supersonic_altitude_ft
 
             elif anomaly_type == "direction_change":
                 velocity_knots = random.uniform(400, 600)
@@ -233,6 +397,7 @@ class AircraftManager:
                     velocity_knots=velocity_knots,
                     initial_direction_deg=direction,
                     change_interval_sec=change_interval,
+                    start_time=start_time,
                 )
                 altitude_ft = random.randint(20000, 40000)
 
@@ -248,12 +413,13 @@ class AircraftManager:
                     start_lon=start_lon,
                     direction_deg=direction,
                     speed_profile=speed_profile,
+                    start_time=start_time,
                 )
                 altitude_ft = random.randint(15000, 35000)
 
             flight_number = f"ANOM{i + 1:02d}   "
 
-            has_adsb = random.random() < ANOMALY_ADSB_PROBABILITY
+            has_adsb = random.random() < CONFIG.anomaly_adsb_probability
             adsb_accurate = True
             adsb_gs_override = None
             adsb_track_override = None
@@ -278,90 +444,234 @@ class AircraftManager:
             self.aircraft_list.append(aircraft)
             aircraft_index += 1
 
-    def get_all_aircraft_data(self, current_time, timestamp_for_json):
-        data = [aircraft.get_data(current_time, timestamp_for_json) for aircraft in self.aircraft_list]
-        return [d for d in data if d is not None]
-
-    def get_all_aircraft_for_radar(self, current_time):
-        aircraft_data = []
-        for aircraft in self.aircraft_list:
-            lat, lon = aircraft.motion_pattern.get_position(current_time)
-            gs_knots = aircraft.motion_pattern.get_velocity(current_time)
-            track_deg = aircraft.motion_pattern.get_heading(current_time)
+    def get_motion_states(self, current_time):
+        """
+        Evaluate every motion pattern once at current_time.
+
+        Returns:
+            np.ndarray: shape (n_aircraft, 4), one (lat, lon, gs_knots, track_deg)
+            row per aircraft in aircraft_list order
+        """
+        states = np.empty((len(self.aircraft_list), 4), dtype=np.float64)
+        for motion, indices in self._motion_groups:
+            states[indices] = motion.get_state(current_time)
+        return states
+
+    def _radar_data(self, current_time, states):
+        """Build RadarAircraftData, with detections for every radar, from the get_motion_states array for current_time."""
+        lat = states[:, 0]
+        lon = states[:, 1]
+        gs_knots = states[:, 2]
+        bistatic_range, doppler_shift = _detect_all(lat, lon, self._alt_m, gs_knots)
+        return RadarAircraftData(
+            time=current_time,
+            hex=self._hex,
+            lat=lat,
+            lon=lon,
+            alt_m=self._alt_m,
+            gs_knots=gs_knots,
+            snr_db=self._snr_db,
+            # Rows must be C-contiguous for orjson to serialize them directly
+            bistatic_range_m=np.ascontiguousarray(np.round(bistatic_range, 2).T),
+            doppler_hz=np.ascontiguousarray(np.round(doppler_shift, 2).T),
+        )
 
-            aircraft_data.append({
-                "hex": aircraft.icao_hex,
-                "lat": lat,
-                "lon": lon,
-                "alt_geom": aircraft.altitude_ft + 100,
-                "gs": gs_knots,
-                "track": track_deg,
-            })
-        return aircraft_data
+    def get_all_aircraft_views(self, current_time, timestamp_for_json):
+        """
+        Evaluate every motion pattern once and build both views from it.
+
+        Returns:
+            tuple: (adsb_data, radar_data), the tar1090 entries of aircraft with
+            ADS-B and a RadarAircraftData for every aircraft
+        """
+        states = self.get_motion_states(current_time)
+        adsb_data = [
+            aircraft.adsb_data(*state)
+            for aircraft, state in zip(self._adsb_aircraft, states[self._adsb_indices].tolist())
+        ]
+        return adsb_data, self._radar_data(current_time, states)
+
+    def _build_snapshot(self, now):
+        """Evaluate every aircraft at now into a (time bucket, adsb payload, radar data) snapshot."""
+        if CONFIG.freeze_aircraft:
+            now = CONFIG.frozen_timestamp
+        timestamp_for_json = CONFIG.frozen_timestamp if CONFIG.freeze_timestamp else now
+        adsb_data, radar_data = self.get_all_aircraft_views(now, timestamp_for_json)
+        return round(now / SNAPSHOT_INTERVAL), {"now": timestamp_for_json, "aircraft": adsb_data}, radar_data
+
+    def get_snapshot(self, now):
+        """
+        Return (adsb_payload, radar_data) for now.
+
+        With the ticker running this is the latest ticked snapshot. Otherwise
+        it is shared by every request in the same time bucket and evaluated at
+        the first request's now. Either way the payload's "now" matches the
+        positions it carries. With FREEZE_AIRCRAFT every request gets the one
+        snapshot taken at the frozen timestamp.
+        """
+        if self._ticker is not None:
+            # The ticker replaces the snapshot tuple whole, so reading it needs no lock.
+            snapshot = self._snapshot
+        else:
+            if CONFIG.freeze_aircraft:
+                now = CONFIG.frozen_timestamp
+            bucket = round(now / SNAPSHOT_INTERVAL)
+            with self._snapshot_lock:
+                snapshot = self._snapshot
+                if snapshot is None or snapshot[0] != bucket:
+                    snapshot = self._build_snapshot(now)
+                    self._snapshot = snapshot
+        return snapshot[1], snapshot[2]
+
+    def start_ticker(self):
+        """Refresh the snapshot every SNAPSHOT_INTERVAL seconds on a background thread."""
+        if CONFIG.freeze_aircraft:
+            # The snapshot never changes, so there is nothing to refresh.
+            return
+        with self._snapshot_lock:
+            if self._ticker is not None:
+                return
+            self._snapshot = self._build_snapshot(time.time())
+            self._ticker = threading.Thread(target=self._tick, name="snapshot-ticker", daemon=True)
+            self._ticker.start()
+
+    def _tick(self):
+        # Ticks are scheduled on the monotonic clock; snapshots still use wall-clock time.
+        next_tick = time.monotonic()
+        while True:
+            next_tick += SNAPSHOT_INTERVAL
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind; restart the schedule rather than bursting to catch up.
+                next_tick = time.monotonic()
+            try:
+                self._snapshot = self._build_snapshot(time.time())
+            except Exception:
+                # A dead ticker would leave requests on a stale snapshot forever,
+                # so log the failure and try again on the next tick.
+                print("[synthetic_adsb_server] snapshot refresh failed:")
+                traceback.print_exc()
 
 
 aircraft_manager = AircraftManager()
 
-def calculate_bistatic_range(aircraft_lat, aircraft_lon, aircraft_alt, tx_lat, tx_lon, tx_alt, rx_lat, rx_lon, rx_alt):
-    """Calculate bistatic range (distance from tx to aircraft to rx)."""
-    # Simplified calculation using great circle distance
-    def distance(lat1, lon1, alt1, lat2, lon2, alt2):
-        # Convert to radians
-        lat1_r, lon1_r = math.radians(lat1), math.radians(lon1)
-        lat2_r, lon2_r = math.radians(lat2), math.radians(lon2)
-        
-        # Haversine formula for surface distance
-        dlat = lat2_r - lat1_r
-        dlon = lon2_r - lon1_r
-        a = math.sin(dlat/2)**2 + math.cos(lat1_r) * math.cos(lat2_r) * math.sin(dlon/2)**2
-        surface_dist = 2 * 6371000 * math.asin(math.sqrt(a))  # Earth radius in meters
-        
-        # Add altitude difference
-        alt_diff = alt2 - alt1
-        return math.sqrt(surface_dist**2 + alt_diff**2)
-    
-    tx_to_aircraft = distance(tx_lat, tx_lon, tx_alt, aircraft_lat, aircraft_lon, aircraft_alt)
-    aircraft_to_rx = distance(aircraft_lat, aircraft_lon, aircraft_alt, rx_lat, rx_lon, rx_alt)
-    
-    return tx_to_aircraft + aircraft_to_rx
-
-def generate_synthetic_detections(aircraft_data_list, radar_config):
-    """Generate synthetic radar detections for all aircraft and given radar."""
-    if not aircraft_data_list:
-        return []
-
-    detections = []
-    now = time.time()
-
-    for aircraft in aircraft_data_list:
-        bistatic_range = calculate_bistatic_range(
-            aircraft["lat"],
-            aircraft["lon"],
-            aircraft["alt_geom"] * 0.3048,
-            TX_LAT,
-            TX_LON,
-            TX_ALT,
-            radar_config["lat"],
-            radar_config["lon"],
-            radar_config["alt"],
-        )
 
-        velocity_ms = aircraft["gs"] * 0.514444
-        doppler_shift = velocity_ms * 2 * radar_config["frequency"] / 299792458
-
-        detection = {
-            "detection_id": str(uuid.uuid4()),
-            "timestamp": now,
-            "bistatic_range_m": round(bistatic_range, 2),
-            "doppler_hz": round(doppler_shift, 2),
-            "snr_db": 15.0 + (hash(aircraft["hex"]) % 10),
-            "radar_id": radar_config["id"],
-            "frequency_hz": radar_config["frequency"],
-            "icao_hex": aircraft["hex"],
-        }
-        detections.append(detection)
+def _slant_range(aircraft_lat_rad, aircraft_lon_rad, aircraft_cos_lat, aircraft_alt, site_lat_rad, site_lon_rad, site_cos_lat, site_alt):
+    """Distance in meters from aircraft to site; array arguments broadcast against each other.
+
+    Positions are in radians, with the cosine of each latitude supplied by the
+    caller so request-invariant sites never redo their trig.
+    """
+    # Great circle (haversine) surface distance with the altitude difference
+    # added in quadrature.
+    a = (
+        np.sin((site_lat_rad - aircraft_lat_rad) / 2) ** 2
+        + aircraft_cos_lat * site_cos_lat * np.sin((site_lon_rad - aircraft_lon_rad) / 2) ** 2
+    )
+    surface = 2 * 6371000 * np.arcsin(np.sqrt(a))  # Earth radius in meters
+    return np.hypot(surface, site_alt - aircraft_alt)
+
+# Transmitter followed by every receiver, so both legs of every bistatic path
+# come out of a single _slant_range pass. Column 0 is the transmitter and
+# column 1 + RadarConfig.index the receiver.
+_site_lat_rad = np.concatenate(([TX_LAT_RAD], _rx_lat_rad))
+_site_lon_rad = np.concatenate(([TX_LON_RAD], _rx_lon_rad))
+_site_cos_lat = np.concatenate(([TX_COS_LAT], _rx_cos_lat))
+_site_alt = np.concatenate(([CONFIG.tx_alt], _rx_alt))
+
+def _detect_all(aircraft_lat, aircraft_lon, aircraft_alt_m, aircraft_gs_knots):
+    """Compute bistatic range and doppler for every aircraft against every radar.
+
+    Takes one-dimensional float arrays with one entry per aircraft.
+
+    Returns:
+        tuple: (bistatic_range_m, doppler_hz), each of shape (n_aircraft, n_radars)
+    """
+    aircraft_lat_rad = np.radians(aircraft_lat)[:, np.newaxis]
+    slant_range = _slant_range(
+        aircraft_lat_rad,
+        np.radians(aircraft_lon)[:, np.newaxis],
+        np.cos(aircraft_lat_rad),
+        aircraft_alt_m[:, np.newaxis],
+        _site_lat_rad,
+        _site_lon_rad,
+        _site_cos_lat,
+        _site_alt,
+    )
+    bistatic_range = slant_range[:, :1] + slant_range[:, 1:]
+    doppler_shift = aircraft_gs_knots[:, np.newaxis] * 0.514444 * _doppler_scale
+    return bistatic_range, doppler_shift
+
+def generate_detection_arrays(aircraft_data, radar_config):
+    """Generate synthetic detections for all aircraft (a RadarAircraftData) and given radar.
+
+    Returns:
+        tuple: (bistatic_range_m, doppler_hz, snr_db) as NumPy arrays with one
+        entry per aircraft, ranges and doppler rounded to 2 decimals
+    """
+    index = radar_config.index
+    return aircraft_data.bistatic_range_m[index], aircraft_data.doppler_hz[index], aircraft_data.snr_db
+
+
+def build_config_payload(config, tar1090_url):
+    """Build the static part of a blah2 /api/config response for a radar."""
+    return {
+        "location": {
+            "rx": {
+                "latitude": config.lat,
+                "longitude": config.lon,
+                "altitude": config.alt
+            },
+            "tx": {
+                "latitude": CONFIG.tx_lat,
+                "longitude": CONFIG.tx_lon,
+                "altitude": CONFIG.tx_alt
+            }
+        },
+        "capture": {
+            "fc": config.frequency
+        },
+        "truth": {
+            "adsb": {
+                "tar1090": tar1090_url
+            }
+        },
+        "radar_id": config.id,
+        "status": "operational",
+    }
 
-    return detections
+
+# The first radar in RADARS answers /api/* on ports that belong to no radar.
+DEFAULT_RADAR = next(iter(CONFIG.radars.values()))
+
+
+def _config_body_prefix(config, tar1090_url):
+    """Serialize a radar's config payload up to where its timestamp value goes."""
+    return orjson.dumps(build_config_payload(config, tar1090_url))[:-1] + b',"timestamp":'
+
+
+# Only the timestamp changes between /api/config responses, so each body is
+# serialized once and completed per request by _config_response.
+_config_body_prefixes = {
+    port: _config_body_prefix(config, "http://synthetic-adsb-test:5001")
+    for port, config in CONFIG.radars.items()
+}
+_radar_config_body_prefixes = {
+    port: _config_body_prefix(config, "http://localhost:5001")
+    for port, config in CONFIG.radars.items()
+}
+
+
+def _config_response(body_prefix):
+    return _json_response(body_prefix + orjson.dumps(time.time()) + b"}")
+
+
+# With FREEZE_AIRCRAFT the aircraft.json body never changes, so it is serialized once.
+_frozen_aircraft_body = (
+    orjson.dumps(aircraft_manager.get_snapshot(CONFIG.frozen_timestamp)[0]) if CONFIG.freeze_aircraft else None
+)
 
 
 @app.route("/data/aircraft.json")
@@ -369,46 +679,95 @@ def serve_synthetic_adsb():
     """
     Generate aircraft data for all configured aircraft (normal + anomalous).
     """
-    timestamp_for_json = FROZEN_TIMESTAMP if FREEZE_TIMESTAMP else time.time()
-    now = time.time()
+    if _frozen_aircraft_body is not None:
+        return _json_response(_frozen_aircraft_body)
+    payload, _ = aircraft_manager.get_snapshot(time.time())
+    return _json(payload)
 
-    aircraft_data = aircraft_manager.get_all_aircraft_data(now, timestamp_for_json)
 
-    return jsonify({"now": timestamp_for_json, "aircraft": aircraft_data})
+# Seconds between events on /data/aircraft.stream.
+STREAM_INTERVAL = 1.0
 
+# Each open stream holds a waitress worker thread, so streams may use at most
+# half of them and polling requests are never starved.
+_stream_slots = threading.BoundedSemaphore(max(1, CONFIG.server_threads // 2))
 
-@app.route("/api/detection")
-def radar_detection():
-    """Generate synthetic radar detection data in blah2 format."""
+
+def _aircraft_events():
+    """Yield an aircraft.json snapshot as a server-sent event every STREAM_INTERVAL seconds."""
+    while True:
+        if _frozen_aircraft_body is not None:
+            body = _frozen_aircraft_body
+        else:
+            payload, _ = aircraft_manager.get_snapshot(time.time())
+            body = orjson.dumps(payload)
+        yield b"data: " + body + b"\n\n"
+        time.sleep(STREAM_INTERVAL)
+
+
+@app.route("/data/aircraft.stream")
+def stream_synthetic_adsb():
+    """
+    Stream /data/aircraft.json snapshots over one connection as server-sent events.
+    """
+    headers = {**_CORS_HEADERS, "Cache-Control": "no-cache"}
+    if request.method == "HEAD":
+        # No body is sent, so no thread is held and no slot is needed.
+        return Response(mimetype="text/event-stream", headers=headers)
+
+    if not _stream_slots.acquire(blocking=False):
+        return Response("Too many open streams\n", status=503, mimetype="text/plain", headers=_CORS_HEADERS)
+    response = Response(_aircraft_events(), mimetype="text/event-stream", headers=headers)
+    # The server closes the response whether or not the body was ever iterated.
+    response.call_on_close(_stream_slots.release)
+    return response
+
+
+def _request_port():
+    """Return the local port the current request arrived on."""
     port = request.environ.get("SERVER_PORT", 5001)
     try:
-        port = int(port)
-    except:
-        port = 5001
+        return int(port)
+    except (TypeError, ValueError):
+        return 5001
+
+
+def _radar_detection(radar_config):
+    """Generate synthetic radar detection data in blah2 format for radar_config."""
+    _, aircraft_data = aircraft_manager.get_snapshot(time.time())
+    bistatic_ranges, dopplers, snrs = generate_detection_arrays(aircraft_data, radar_config)
+
+    return _json(
+        {
+            "timestamp": int(aircraft_data.time * 1000),
+            "delay": bistatic_ranges / 299792458,
+            "doppler": dopplers,
+            "snr": snrs,
+            "status": "active",
+        }
+    )
 
-    radar_config = radar_configs.get(port)
-    if not radar_config:
-        radar_config = radar_configs[49158]
 
-    current_time = time.time()
-    aircraft_data = aircraft_manager.get_all_aircraft_for_radar(current_time)
+@app.route("/radar/<int:port>/api/detection")
+def radar_port_detection(port):
+    """Generate synthetic radar detection data in blah2 format, with delay in km."""
+    radar_config = CONFIG.radars.get(port)
+    if not radar_config:
+        abort(404)
 
-    delays = []
-    dopplers = []
-    snrs = []
+    _, aircraft_data = aircraft_manager.get_snapshot(time.time())
+    bistatic_ranges, dopplers, snrs = generate_detection_arrays(aircraft_data, radar_config)
+    delays = bistatic_ranges / 1000.0
 
-    if aircraft_data:
-        detections = generate_synthetic_detections(aircraft_data, radar_config)
-        for detection in detections:
-            delay_seconds = detection["bistatic_range_m"] / 299792458
-            delays.append(delay_seconds)
-            dopplers.append(detection["doppler_hz"])
-            snrs.append(detection["snr_db"])
+    for delay_km in delays[(delays < 5.0) | (delays > 300.0)].tolist():
+        if delay_km < 5.0:
+            print(f"WARNING: Unrealistically small bistatic range: {delay_km:.3f} km")
+        else:
+            print(f"WARNING: Unrealistically large bistatic range: {delay_km:.3f} km")
 
-    current_time = time.time()
-    return jsonify(
+    return _json(
         {
-            "timestamp": int(current_time * 1000),
+            "timestamp": int(aircraft_data.time * 1000),
             "delay": delays,
             "doppler": dopplers,
             "snr": snrs,
@@ -417,166 +776,62 @@ def radar_detection():
     )
 
 
-@app.route("/api/config")
-def radar_config():
+@app.route("/radar/<int:port>/api/config")
+def radar_port_config(port):
     """Return radar configuration in blah2 format."""
-    port = request.environ.get('SERVER_PORT', 5001)
-    try:
-        port = int(port)
-    except:
-        port = 5001
-        
-    config = radar_configs.get(port, radar_configs[49158])
-    
-    return jsonify({
-        "location": {
-            "rx": {
-                "latitude": config["lat"],
-                "longitude": config["lon"],
-                "altitude": config["alt"]
-            },
-            "tx": {
-                "latitude": TX_LAT,
-                "longitude": TX_LON,
-                "altitude": TX_ALT
-            }
-        },
-        "capture": {
-            "fc": config["frequency"]
-        },
-        "truth": {
-            "adsb": {
-                "tar1090": f"http://synthetic-adsb-test:5001"
-            }
-        },
-        "radar_id": config["id"],
-        "status": "operational",
-        "timestamp": time.time()
-    })
+    body_prefix = _radar_config_body_prefixes.get(port)
+    if not body_prefix:
+        abort(404)
+    return _config_response(body_prefix)
 
 
-@app.route("/radar1")
-def radar1_detection():
-    """Radar 1 detection endpoint."""
-    os.environ['SERVER_PORT'] = '49158'
-    return radar_detection()
+@app.route("/api/detection")
+def radar_detection():
+    """Generate synthetic radar detection data in blah2 format."""
+    port = _request_port()
+    if port in CONFIG.radars:
+        # Request arrived on a radar's own port
+        return radar_port_detection(port)
+    return _radar_detection(DEFAULT_RADAR)
 
 
-@app.route("/radar2") 
-def radar2_detection():
-    """Radar 2 detection endpoint."""
-    os.environ['SERVER_PORT'] = '49159'
-    return radar_detection()
+@app.route("/api/config")
+def radar_config():
+    """Return radar configuration in blah2 format."""
+    port = _request_port()
+    if port in CONFIG.radars:
+        return radar_port_config(port)
+    return _config_response(_config_body_prefixes[DEFAULT_RADAR.port])
 
 
-@app.route("/radar3")
-def radar3_detection():
-    """Radar 3 detection endpoint."""
-    os.environ['SERVER_PORT'] = '49160'
-    return radar_detection()
+def _radar_detection_view(radar_config):
+    """Build the view function for a /radarN detection endpoint."""
+    def radar_detection_view():
+        return _radar_detection(radar_config)
+    return radar_detection_view
 
 
-def run_server():
-    app.run(host=HOST, port=PORT, threaded=True)
-
-
-def create_radar_app(port):
-    """Create a separate Flask app for radar detection on a specific port."""
-    radar_app = Flask(f'radar_{port}')
-    CORS(radar_app)
-    
-    @radar_app.route("/api/detection")
-    def radar_detection():
-        """Generate synthetic radar detection data in blah2 format."""
-        radar_config = radar_configs.get(port, radar_configs[49158])
-
-        current_time = time.time()
-        aircraft_data = aircraft_manager.get_all_aircraft_for_radar(current_time)
-
-        delays = []
-        dopplers = []
-        snrs = []
-
-        if aircraft_data:
-            detections = generate_synthetic_detections(aircraft_data, radar_config)
-            for detection in detections:
-                delay_km = detection["bistatic_range_m"] / 1000.0
-
-                if delay_km < 5.0:
-                    print(f"WARNING: Unrealistically small bistatic range: {delay_km:.3f} km")
-                elif delay_km > 300.0:
-                    print(f"WARNING: Unrealistically large bistatic range: {delay_km:.3f} km")
-
-                delays.append(delay_km)
-                dopplers.append(detection["doppler_hz"])
-                snrs.append(detection["snr_db"])
-
-        current_time = time.time()
-        return jsonify(
-            {
-                "timestamp": int(current_time * 1000),
-                "delay": delays,
-                "doppler": dopplers,
-                "snr": snrs,
-                "status": "active",
-            }
-        )
-    
-    @radar_app.route("/api/config")
-    def radar_config_endpoint():
-        """Return radar configuration in blah2 format."""
-        config = radar_configs.get(port, radar_configs[49158])
-        return jsonify({
-            "location": {
-                "rx": {
-                    "latitude": config["lat"],
-                    "longitude": config["lon"],
-                    "altitude": config["alt"]
-                },
-                "tx": {
-                    "latitude": TX_LAT,
-                    "longitude": TX_LON,
-                    "altitude": TX_ALT
-                }
-            },
-            "capture": {
-                "fc": config["frequency"]
-            },
-            "truth": {
-                "adsb": {
-                    "tar1090": f"http://localhost:5001"
-                }
-            },
-            "radar_id": config["id"],
-            "status": "operational",
-            "timestamp": time.time()
-        })
-    
-    return radar_app
+# /radar1, /radar2, ... serve the radars in the order they are listed in RADARS.
+for number, config in enumerate(CONFIG.radars.values(), start=1):
+    app.add_url_rule(f"/radar{number}", f"radar{number}_detection", _radar_detection_view(config))
 
-def run_radar_server(port):
-    """Run additional radar servers on different ports."""
-    radar_app = create_radar_app(port)
-    radar_app.run(host=HOST, port=port, threaded=True)
+
+def run_server():
+    """Serve the app on PORT and on every radar's legacy port from one waitress server."""
+    aircraft_manager.start_ticker()
+    ports = [CONFIG.port, *CONFIG.radars]
+    listen = " ".join(f"{CONFIG.host}:{port}" for port in ports)
+    serve(app, listen=listen, threads=CONFIG.server_threads)
 
 
 if __name__ == "__main__":
     print(
-        f"[synthetic_adsb_server] starting on http://{HOST}:{PORT}/data/aircraft.json"
+        f"[synthetic_adsb_server] starting on http://{CONFIG.host}:{CONFIG.port}/data/aircraft.json"
     )
-    
-    # Start main ADS-B server
-    threading.Thread(target=run_server, daemon=True).start()
-    
-    # Always start radar detection servers on their respective ports
-    radar_ports = sorted(radar_configs.keys())
+    radar_ports = sorted(CONFIG.radars.keys())
     print(f"[synthetic_adsb_server] starting radar APIs on ports {', '.join(map(str, radar_ports))}")
-    for port in radar_ports:
-        threading.Thread(target=lambda p=port: run_radar_server(p), daemon=True).start()
-    
+
     try:
-        # Keep the main thread alive
-        while True:
-            time.sleep(3600)
+        run_server()
     except KeyboardInterrupt:
         print("\n[synthetic_adsb_server] shutting down.")
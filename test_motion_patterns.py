@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the motion patterns.
+
+Each anomalous pattern is checked against a straightforward reference that
+walks its segments linearly and scales longitude at the current latitude, as
+the patterns did before segment lookup moved to bisect over parallel lists.
+"""
+
+import unittest
+import math
+from motion_patterns import (
+    CircularMotion,
+    SupersonicLinearMotion,
+    InstantDirectionChangeMotion,
+    InstantAccelerationMotion,
+)
+
+T0 = 1.76e9
+TOLERANCE = 1e-9
+# Closed segments scale longitude by their leg-start cos(lat), which leaves a
+# small error at each segment end. It is carried onto the open-ended last
+# segment but must not grow there.
+LEG_START_COS_TOLERANCE = 1e-6
+
+
+def _reference_advance(lat, lon, speed_ms, elapsed, direction_rad):
+    distance_deg = speed_ms * elapsed / 111320
+    lat += distance_deg * math.cos(direction_rad)
+    return lat, lon + distance_deg * math.sin(direction_rad) / math.cos(math.radians(lat))
+
+
+def _reference_direction_change(start_lat, start_lon, velocity_knots, direction_deg, interval, dt):
+    """Reference (lat, lon, heading) for InstantDirectionChangeMotion."""
+    speed_ms = velocity_knots * 0.514444
+    segments = [(0, start_lat, start_lon, math.radians(direction_deg))]
+    for _ in range(10):
+        seg_time, lat, lon, direction = segments[-1]
+        lat, lon = _reference_advance(lat, lon, speed_ms, interval, direction)
+        segments.append((seg_time + interval, lat, lon, math.radians((math.degrees(direction) + 90) % 360)))
+
+    active = segments[-1]
+    for seg, next_seg in zip(segments, segments[1:]):
+        if seg[0] <= dt < next_seg[0]:
+            active = seg
+            break
+
+    seg_time, lat, lon, direction = active
+    lat, lon = _reference_advance(lat, lon, speed_ms, dt - seg_time, direction)
+    return lat, lon, math.degrees(direction) % 360
+
+
+def _reference_acceleration(start_lat, start_lon, direction_deg, speed_profile, dt):
+    """Reference (lat, lon, speed_knots) for InstantAccelerationMotion."""
+    direction = math.radians(direction_deg)
+    segments = []
+    lat, lon, seg_time = start_lat, start_lon, 0
+    for duration_sec, speed_knots in speed_profile:
+        segments.append((seg_time, seg_time + duration_sec, lat, lon, speed_knots))
+        lat, lon = _reference_advance(lat, lon, speed_knots * 0.514444, duration_sec, direction)
+        seg_time += duration_sec
+
+    for start, end, lat, lon, speed_knots in segments:
+        if start <= dt < end:
+            elapsed = dt - start
+            break
+    else:
+        # Past the profile (or before it) the last segment is extrapolated from its end time
+        start, end, lat, lon, speed_knots = segments[-1]
+        elapsed = dt - end
+
+    lat, lon = _reference_advance(lat, lon, speed_knots * 0.514444, elapsed, direction)
+    return lat, lon, speed_knots
+
+
+class TestMotionPatterns(unittest.TestCase):
+    """Test cases for the motion pattern classes."""
+
+    def assertStateMatches(self, pattern, current_time, expected, position_tolerance=TOLERANCE):
+        """Check get_position/get_velocity/get_heading and get_state against expected state."""
+        lat, lon, velocity, heading = expected
+        self.assertAlmostEqual(pattern.get_position(current_time)[0], lat, delta=position_tolerance)
+        self.assertAlmostEqual(pattern.get_position(current_time)[1], lon, delta=position_tolerance)
+        self.assertAlmostEqual(pattern.get_velocity(current_time), velocity, delta=TOLERANCE)
+        self.assertAlmostEqual(pattern.get_heading(current_time), heading, delta=TOLERANCE)
+
+        state = pattern.get_state(current_time)
+        self.assertEqual(len(state), 4)
+        for actual, wanted, tolerance in zip(state, expected, [position_tolerance] * 2 + [TOLERANCE] * 2):
+            self.assertAlmostEqual(actual, wanted, delta=tolerance)
+
+    def test_circular_motion(self):
+        """Test circular motion against the closed-form track"""
+        pattern = CircularMotion(-34.98, 138.7, 0.05, 0.01)
+        for current_time in [T0 - 3.0, T0, T0 + 0.37, T0 + 1000.0]:
+            theta = (current_time * 0.01) % math.tau
+            lat = -34.98 + 0.05 * math.cos(theta)
+            lon = 138.7 + 0.05 * math.sin(theta)
+            rate_m = 0.05 * 0.01 * 111320
+            dlat_dt_m = -rate_m * math.sin(theta)
+            dlon_dt_m = rate_m * math.cos(theta) * math.cos(math.radians(lat))
+            expected = (
+                lat,
+                lon,
+                math.hypot(dlat_dt_m, dlon_dt_m) * 1.94384,
+                math.degrees(math.atan2(dlon_dt_m, dlat_dt_m)) % 360,
+            )
+            self.assertStateMatches(pattern, current_time, expected)
+
+    def test_supersonic_motion(self):
+        """Test supersonic motion before, at and long after its start time"""
+        pattern = SupersonicLinearMotion(-34.9, 138.6, 3.3, 37.0, start_time=T0)
+        velocity_ms = 3.3 * 343.0
+        direction = math.radians(37.0)
+        for dt in [-5.0, 0.0, 0.37, 600.0, 36000.0]:
+            distance_deg = velocity_ms * dt / 111320
+            lat = -34.9 + distance_deg * math.cos(direction)
+            lon = 138.6 + distance_deg * math.sin(direction) / math.cos(math.radians(lat))
+            self.assertStateMatches(pattern, T0 + dt, (lat, lon, velocity_ms * 1.94384, 37.0))
+
+    def test_direction_change_motion(self):
+        """Test direction change motion before, inside, on the boundaries of and past its segments"""
+        args = (-34.9, 138.6, 500, 123.0, 4.5)
+        pattern = InstantDirectionChangeMotion(*args, start_time=T0)
+
+        boundaries = [k * 4.5 for k in range(11)]
+        samples = [-10.0, -0.01] + boundaries + [b + 0.37 for b in boundaries] + [b - 1e-6 for b in boundaries[1:]]
+        samples += [-3600.0, 45.0 + 100.0, 45.0 + 3600.0, 45.0 + 4 * 3600.0]
+        for dt in samples:
+            with self.subTest(dt=dt):
+                lat, lon, heading = _reference_direction_change(*args, dt)
+                self.assertStateMatches(
+                    pattern, T0 + dt, (lat, lon, 500, heading), position_tolerance=LEG_START_COS_TOLERANCE
+                )
+
+    def test_direction_change_boundaries(self):
+        """Test that a new heading takes effect exactly at each direction change"""
+        pattern = InstantDirectionChangeMotion(-34.9, 138.6, 500, 123.0, 4.5, start_time=T0)
+        for k in range(1, 11):
+            boundary = T0 + k * 4.5
+            self.assertAlmostEqual(pattern.get_heading(boundary), (123.0 + 90 * k) % 360)
+            self.assertAlmostEqual(pattern.get_heading(boundary - 1e-3), (123.0 + 90 * (k - 1)) % 360)
+
+            # The track is continuous across the turn
+            before = pattern.get_position(boundary - 1e-6)
+            after = pattern.get_position(boundary)
+            self.assertAlmostEqual(before[0], after[0], delta=1e-6)
+            self.assertAlmostEqual(before[1], after[1], delta=1e-6)
+
+        # Before start_time the last segment applies
+        self.assertAlmostEqual(pattern.get_heading(T0 - 1.0), (123.0 + 900) % 360)
+
+    def test_acceleration_motion(self):
+        """Test acceleration motion before, inside, on the boundaries of and past its profile"""
+        profile = [(3.0, 400), (2.0, 0), (3.0, 600), (4.0, 300)]
+        args = (-34.9, 138.6, 250.0, profile)
+        pattern = InstantAccelerationMotion(*args, start_time=T0)
+
+        boundaries = [0.0, 3.0, 5.0, 8.0, 12.0]
+        samples = [-10.0, -0.01] + boundaries + [b + 0.37 for b in boundaries] + [b - 1e-6 for b in boundaries[1:]]
+        samples += [-3600.0, 12.0 + 100.0, 12.0 + 3600.0, 12.0 + 4 * 3600.0]
+        for dt in samples:
+            with self.subTest(dt=dt):
+                lat, lon, speed_knots = _reference_acceleration(*args, dt)
+                self.assertStateMatches(
+                    pattern, T0 + dt, (lat, lon, speed_knots, 250.0), position_tolerance=LEG_START_COS_TOLERANCE
+                )
+
+    def test_acceleration_boundaries(self):
+        """Test that each new speed takes effect exactly at its segment start"""
+        profile = [(3.0, 400), (2.0, 0), (3.0, 600), (4.0, 300)]
+        pattern = InstantAccelerationMotion(-34.9, 138.6, 250.0, profile, start_time=T0)
+
+        self.assertEqual(pattern.get_velocity(T0), 400)
+        self.assertEqual(pattern.get_velocity(T0 + 3.0), 0)
+        self.assertEqual(pattern.get_velocity(T0 + 5.0), 600)
+        self.assertEqual(pattern.get_velocity(T0 + 8.0), 300)
+        self.assertEqual(pattern.get_velocity(T0 + 8.0 - 1e-6), 600)
+
+        # Standing still during the zero-speed segment
+        self.assertEqual(pattern.get_position(T0 + 3.0), pattern.get_position(T0 + 4.9))
+
+        # Before start_time and past the profile the last segment's speed is reported
+        self.assertEqual(pattern.get_velocity(T0 - 1.0), 300)
+        self.assertEqual(pattern.get_velocity(T0 + 12.0), 300)
+        self.assertEqual(pattern.get_velocity(T0 + 3600.0), 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
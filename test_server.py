@@ -10,12 +10,17 @@ Tests for the synthetic ADSB server, verifying:
 """
 
 import unittest
+from unittest import mock
 import requests
 import time
 import math
-from server import TX_LAT, TX_LON, RADIUS_DEG, ANGULAR_SPEED, ALT_BARO_FT, ICAO_HEX, PORT
+import json
+import os
+import subprocess
+import sys
+from server import CONFIG, Config
 import threading
-from server import run_server
+from server import run_server, app, _stream_slots, AircraftManager, SNAPSHOT_INTERVAL
 
 class TestSyntheticADSB(unittest.TestCase):
     @classmethod
@@ -25,7 +30,7 @@ class TestSyntheticADSB(unittest.TestCase):
         cls.server_thread.start()
         time.sleep(1)  # Give server time to start
         
-        cls.base_url = f"http://localhost:{PORT}"
+        cls.base_url = f"http://localhost:{CONFIG.port}"
         cls.endpoint = f"{cls.base_url}/data/aircraft.json"
 
     def test_server_responds(self):
@@ -45,10 +50,10 @@ class TestSyntheticADSB(unittest.TestCase):
         
         # Check aircraft data
         aircraft = data["aircraft"][0]
-        self.assertEqual(aircraft["hex"], ICAO_HEX)
+        self.assertEqual(aircraft["hex"], CONFIG.icao_hex)
         self.assertIsInstance(aircraft["lat"], float)
         self.assertIsInstance(aircraft["lon"], float)
-        self.assertEqual(aircraft["alt_baro"], ALT_BARO_FT)
+        self.assertEqual(aircraft["alt_baro"], CONFIG.alt_baro_ft)
         self.assertEqual(aircraft["seen_pos"], 0)
 
     def test_position_calculation(self):
@@ -59,9 +64,9 @@ class TestSyntheticADSB(unittest.TestCase):
         
         # Calculate expected position
         now = data["now"]
-        theta = (now * ANGULAR_SPEED) % (2 * math.pi)
-        expected_lat = TX_LAT + RADIUS_DEG * math.cos(theta)
-        expected_lon = TX_LON + RADIUS_DEG * math.sin(theta)
+        theta = (now * CONFIG.angular_speed) % (2 * math.pi)
+        expected_lat = CONFIG.tx_lat + CONFIG.radius_deg * math.cos(theta)
+        expected_lon = CONFIG.tx_lon + CONFIG.radius_deg * math.sin(theta)
         
         # Allow for small floating point differences
         self.assertAlmostEqual(aircraft["lat"], expected_lat, places=6)
@@ -80,5 +85,183 @@ class TestSyntheticADSB(unittest.TestCase):
         data = response.json()
         self.assertAlmostEqual(data["now"], time.time(), delta=1.0)
 
+    def test_radar_path_endpoints(self):
+        """Verify each radar is reachable by path on the main server"""
+        for port, config in CONFIG.radars.items():
+            response = requests.get(f"{self.base_url}/radar/{port}/api/detection")
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertEqual(len(data["delay"]), len(data["doppler"]))
+
+            response = requests.get(f"{self.base_url}/radar/{port}/api/config")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["radar_id"], config.id)
+
+        response = requests.get(f"{self.base_url}/radar/1/api/detection")
+        self.assertEqual(response.status_code, 404)
+
+    def test_radar_number_endpoints(self):
+        """Verify /radarN serves the Nth radar listed in RADARS"""
+        # Routes are registered at import, so the server is loaded with a
+        # RADARS list whose order differs from its port order.
+        script = """
+import server
+server._radar_detection = lambda radar_config: radar_config.id
+client = server.app.test_client()
+print(" ".join(client.get(f"/radar{number}").text for number in range(1, 4)), client.get("/radar4").status_code)
+"""
+        radars = [
+            {"id": "rxA", "lat": -34.8414, "lon": 138.7237, "alt": 230, "port": 49160},
+            {"id": "rxB", "lat": -34.9192, "lon": 138.6027, "alt": 110, "port": 49158},
+            {"id": "rxC", "lat": -34.9315, "lon": 138.6967, "alt": 408, "port": 49159},
+        ]
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            env={**os.environ, "RADARS": json.dumps(radars)},
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.splitlines()[-1], "rxA rxB rxC 404")
+
+    def test_config_from_env(self):
+        """Verify Config.from_env applies defaults and rejects missing, empty and malformed settings"""
+        with mock.patch.dict(os.environ):
+            os.environ.pop("SERVER_THREADS", None)
+            config = Config.from_env()
+        self.assertEqual(config.server_threads, 8)
+        self.assertEqual(list(config.radars), list(CONFIG.radars))
+
+        radar = {"id": "rx1", "lat": -34.9192, "lon": 138.6027, "alt": 110, "port": 49158}
+        invalid_settings = [
+            ({"TX_LAT": None}, EnvironmentError),
+            ({"HOST": ""}, EnvironmentError),
+            ({"RADARS": None}, EnvironmentError),
+            ({"RADARS": ""}, EnvironmentError),
+            ({"RADARS": "not json"}, EnvironmentError),
+            ({"RADARS": "[]"}, EnvironmentError),
+            ({"RADARS": json.dumps([{k: v for k, v in radar.items() if k != "port"}])}, EnvironmentError),
+            ({"TX_LAT": "north"}, ValueError),
+            ({"PORT": "5001.5"}, ValueError),
+            ({"SERVER_THREADS": "many"}, ValueError),
+        ]
+        for settings, error in invalid_settings:
+            with self.subTest(settings=settings), mock.patch.dict(os.environ):
+                for name, value in settings.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+                with self.assertRaises(error):
+                    Config.from_env()
+
+    def test_aircraft_stream(self):
+        """Verify the event stream delivers aircraft.json snapshots"""
+        with requests.get(f"{self.base_url}/data/aircraft.stream", stream=True, timeout=5) as response:
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.headers["Content-Type"].startswith("text/event-stream"))
+
+            line = next(line for line in response.iter_lines() if line)
+            self.assertTrue(line.startswith(b"data: "))
+            data = json.loads(line[len(b"data: "):])
+            self.assertIn("now", data)
+            self.assertEqual(data["aircraft"][0]["hex"], CONFIG.icao_hex)
+
+    def test_aircraft_stream_head(self):
+        """Verify HEAD requests on the stream do not use up stream slots"""
+        url = f"{self.base_url}/data/aircraft.stream"
+        for _ in range(CONFIG.server_threads):
+            response = requests.head(url, timeout=5)
+            self.assertEqual(response.status_code, 200)
+
+        with requests.get(url, stream=True, timeout=5) as response:
+            self.assertEqual(response.status_code, 200)
+
+    def test_aircraft_stream_refused(self):
+        """Verify a refused stream still carries the CORS header"""
+        acquired = 0
+        while _stream_slots.acquire(blocking=False):
+            acquired += 1
+        try:
+            response = app.test_client().get("/data/aircraft.stream")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.headers["Access-Control-Allow-Origin"], "*")
+        finally:
+            for _ in range(acquired):
+                _stream_slots.release()
+
+    def test_frozen_aircraft(self):
+        """Verify FREEZE_AIRCRAFT holds anomalous aircraft at their starting state"""
+        # The freeze settings are read at import, so the frozen server is loaded
+        # in a separate interpreter.
+        script = """
+import json
+import server
+from motion_patterns import SupersonicLinearMotion, InstantDirectionChangeMotion
+
+expected = {}
+for aircraft in server.aircraft_manager.aircraft_list:
+    motion = aircraft.motion_pattern
+    if not aircraft.is_anomalous:
+        continue
+    if aircraft.adsb_gs_override is not None:
+        gs = aircraft.adsb_gs_override
+    elif isinstance(motion, SupersonicLinearMotion):
+        gs = motion.velocity_ms * 1.94384
+    elif isinstance(motion, InstantDirectionChangeMotion):
+        gs = motion.velocity_knots
+    else:
+        gs = motion.speed_profile[0][1]
+    expected[aircraft.icao_hex] = [motion.start_lat, motion.start_lon, gs]
+print(json.dumps([json.loads(server._frozen_aircraft_body), server.CONFIG.frozen_timestamp, expected]))
+"""
+        env = {
+            **os.environ,
+            "FREEZE_TIMESTAMP": "true",
+            "FREEZE_AIRCRAFT": "true",
+            "ENABLE_ANOMALIES": "true",
+            "ANOMALOUS_AIRCRAFT_COUNT": "12",
+            "ANOMALY_ADSB_PROBABILITY": "1.0",
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            env=env,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        body, frozen_timestamp, expected = json.loads(result.stdout.splitlines()[-1])
+
+        self.assertEqual(body["now"], frozen_timestamp)
+        anomalous = [aircraft for aircraft in body["aircraft"] if aircraft["hex"] in expected]
+        self.assertEqual(len(anomalous), 12)
+        for aircraft in anomalous:
+            start_lat, start_lon, gs = expected[aircraft["hex"]]
+            self.assertAlmostEqual(aircraft["lat"], start_lat, places=9)
+            self.assertAlmostEqual(aircraft["lon"], start_lon, places=9)
+            self.assertAlmostEqual(aircraft["gs"], gs, places=6)
+
+    def test_ticker_survives_failed_refresh(self):
+        """Verify the snapshot ticker keeps refreshing after a failed tick"""
+        manager = AircraftManager()
+        build_snapshot = manager._build_snapshot
+        calls = []
+
+        def flaky_build_snapshot(now):
+            calls.append(now)
+            if len(calls) == 2:
+                raise RuntimeError("simulated refresh failure")
+            return build_snapshot(now)
+
+        manager._build_snapshot = flaky_build_snapshot
+        manager.start_ticker()
+        time.sleep(SNAPSHOT_INTERVAL * 6)
+
+        payload, _ = manager.get_snapshot(time.time())
+        self.assertGreater(len(calls), 3)
+        self.assertAlmostEqual(payload["now"], time.time(), delta=SNAPSHOT_INTERVAL * 3)
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file